@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from utils.dez_parser import parse_dez_file
 from utils.template_writer import write_entity
@@ -20,10 +21,24 @@ def main(dez_file: str, flags: list[str]):
         _, diag2names = build_diagram_mapping(dez_file)
         to_export = interactive_choice(diag2names)
 
-    for ent in entities:
-        if not to_export or ent["name"] in to_export:
+    to_write = [ent for ent in entities if not to_export or ent["name"] in to_export]
+
+    if len(to_write) <= 1:
+        for ent in to_write:
             write_entity(ent, TEMPLATE, OUT_DIR)
             print(f"✅  wrote {ent['name']}.xlsx")
+        return
+
+    # Each export is an independent CPU-bound openpyxl job (entity dicts and
+    # their Field records pickle cleanly) — fan out across cores.
+    with ProcessPoolExecutor() as executor:
+        futures = {
+            executor.submit(write_entity, ent, TEMPLATE, OUT_DIR): ent["name"]
+            for ent in to_write
+        }
+        for fut in as_completed(futures):
+            fut.result()
+            print(f"✅  wrote {futures[fut]}.xlsx")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
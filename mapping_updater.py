@@ -1,5 +1,5 @@
-import re
 from openpyxl import load_workbook
+from openpyxl.worksheet.cell_range import MultiCellRange
 from utils.helpers import (
     get_header_row, unwrap_merged_headers, copy_table, copy_metadata
 )
@@ -8,59 +8,71 @@ SOURCE_FILE = "inputs/Mapping_1-7.xlsx"
 TARGET_FILE = "templates/mapping_1-11.xlsx"
 OUTPUT_FILE = "outputs/mapping_1-11_UPDATED.xlsx"
 TEMPLATE_SHEET_NAME = "Transformation - Sourcing (1)"
+SHEET_PREFIX = "transformation - sourcing"
 
 
 def run():
     wb_src = load_workbook(SOURCE_FILE, data_only=False)
     wb_tgt = load_workbook(TARGET_FILE)
 
-    pattern = re.compile(r"^Transformation - Sourcing", re.IGNORECASE)
-    src_sheet_names = [name for name in wb_src.sheetnames if pattern.match(name)]
+    src_sheet_names = [name for name in wb_src.sheetnames if name.lower().startswith(SHEET_PREFIX)]
+    tgt_sheet_names = set(wb_tgt.sheetnames)
 
+    if TEMPLATE_SHEET_NAME not in tgt_sheet_names:
+        raise Exception(f"❌ Template sheet '{TEMPLATE_SHEET_NAME}' not found in target.")
+
+    # ✅ Prepare the template sheet ONCE: every target sheet is a copy of it,
+    # so unwrap its headers and unmerge it a single time instead of per sheet.
+    template_ws = wb_tgt[TEMPLATE_SHEET_NAME]
+    for r in range(1, 30):  # Unwrap possible header rows
+        unwrap_merged_headers(template_ws, r)
+    # Clear all ranges in one assignment — per-range unmerge_cells re-parses
+    # the range string and linearly searches the range list every call.
+    template_merges = " ".join(str(rng) for rng in template_ws.merged_cells.ranges)
+    template_ws.merged_cells = MultiCellRange()
+
+    # Target header rows are identical across all template-derived sheets
+    tgt_row_sourcing = get_header_row(template_ws, "Dependency")
+    tgt_row_transform = get_header_row(template_ws, "#")
+
+    written_sheets = []
     for sheet_name in src_sheet_names:
         print(f"\n🔁 Processing: {sheet_name}")
         ws_src = wb_src[sheet_name]
 
-        # Create target sheet if needed
-        if sheet_name not in wb_tgt.sheetnames:
+        # Create target sheet if needed (inherits the unwrapped/unmerged layout)
+        if sheet_name not in tgt_sheet_names:
             print(f"📄 Creating target sheet: '{sheet_name}' from template...")
-            if TEMPLATE_SHEET_NAME not in wb_tgt.sheetnames:
-                raise Exception(f"❌ Template sheet '{TEMPLATE_SHEET_NAME}' not found in target.")
-            template_ws = wb_tgt[TEMPLATE_SHEET_NAME]
             copied_ws = wb_tgt.copy_worksheet(template_ws)
             copied_ws.title = sheet_name
+            tgt_sheet_names.add(sheet_name)
 
         ws_tgt = wb_tgt[sheet_name]
 
         # ✅ Copy metadata top rows like Tablename, Description, etc.
         copy_metadata(ws_src, ws_tgt)
 
-        # ✅ Step 1: unwrap all potential header rows BEFORE header detection
+        # ✅ Step 1: unwrap source header rows BEFORE header detection
         for r in range(1, 30):  # Unwrap possible header rows
             unwrap_merged_headers(ws_src, r)
-            unwrap_merged_headers(ws_tgt, r)
 
-        # ✅ Step 2: Find header rows after unmerging
+        # ✅ Step 2: Find source header rows after unmerging
         src_row_sourcing = get_header_row(ws_src, "Dependency")
-        tgt_row_sourcing = get_header_row(ws_tgt, "Dependency")
         src_row_transform = get_header_row(ws_src, "#")
-        tgt_row_transform = get_header_row(ws_tgt, "#")
 
         print(f"  📌 Header rows - Sourcing: src={src_row_sourcing}, tgt={tgt_row_sourcing}")
         print(f"  📌 Header rows - Transformation: src={src_row_transform}, tgt={tgt_row_transform}")
 
-        # Step 3: Temporarily unmerge target to prevent overlap issues
-        merges = list(ws_tgt.merged_cells.ranges)
-        for rng in merges:
-            ws_tgt.unmerge_cells(str(rng))
-
-        # Step 4: Copy both tables
+        # Step 3: Copy both tables
         copy_table(ws_src, ws_tgt, src_row_sourcing, tgt_row_sourcing, label="Sourcing")
         copy_table(ws_src, ws_tgt, src_row_transform, tgt_row_transform, label="Transformation")
 
-        # Step 5: Re-merge
-        for rng in merges:
-            ws_tgt.merge_cells(str(rng))
+        written_sheets.append(ws_tgt)
+
+    # Step 4: Re-merge every written sheet from the cached template snapshot
+    if template_merges:
+        for ws_tgt in written_sheets:
+            ws_tgt.merged_cells = MultiCellRange(template_merges)
 
     # Final save
     wb_tgt.save(OUTPUT_FILE)
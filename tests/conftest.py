@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils.dez_parser import parse_dez_file  # noqa: E402
+
+DEZ_FILE = ROOT / "inputs" / "orders_bq.dez"
+TEMPLATE = ROOT / "templates" / "mapping_1-11.xlsx"
+
+
+@pytest.fixture(scope="session")
+def dez_entities():
+    """Parse the sample .dez once for the whole session."""
+    return parse_dez_file(DEZ_FILE)
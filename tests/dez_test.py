@@ -1,9 +1,16 @@
-from utils.dez_parser import parse_dez_file
+def test_parse_returns_entities(dez_entities):
+    names = [ent["name"] for ent in dez_entities]
+    assert "Party" in names
+    assert "Order" in names
 
-data = parse_dez_file("../inputs/orders.dez")
 
-print("Versions :", data["versions"])
-print("Diagrams :", data["diagrams"])
-print("Entities :", list(data["entities"].keys())[:5])          # first 5 entities
-first = next(iter(data["entities"].values()))
-print("First entity fields:", first["fields"][:3])              # first 3 fields
\ No newline at end of file
+def test_entity_fields_have_expected_attrs(dez_entities):
+    field = dez_entities[0]["fields"][0]
+    for attr in ("name", "datatype", "sourced", "not_null", "key_type"):
+        assert hasattr(field, attr)
+
+
+def test_primary_key_detected(dez_entities):
+    party = next(ent for ent in dez_entities if ent["name"] == "Party")
+    key_types = {f.name: f.key_type for f in party["fields"]}
+    assert key_types["PartyID"] == "PRIMARY"
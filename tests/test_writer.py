@@ -1,14 +1,17 @@
-from utils.dez_parser import parse_dez_file
-from utils.template_writer import write_entity_to_template
-from pathlib import Path
-
-data = parse_dez_file("../inputs/orders.dez")
-entity_name, entity_data = next(iter(data["entities"].items()))
-entity_data["name"] = entity_name  # add name for writer
-
-output = write_entity_to_template(
-    entity_data,
-    template_path="../templates/mapping_1-11.xlsx",
-    output_dir="../outputs"
-)
-print("✅ wrote:", output)
\ No newline at end of file
+from openpyxl import load_workbook
+
+from tests.conftest import TEMPLATE
+from utils.template_writer import write_entity
+
+
+def test_write_entity_creates_workbook(dez_entities, tmp_path):
+    entity = dez_entities[0]
+    out = write_entity(entity, TEMPLATE, tmp_path)
+
+    assert out == tmp_path / f"{entity['name']}.xlsx"
+    # Reading back is enough here, so skip materializing every cell
+    wb = load_workbook(out, read_only=True, data_only=True)
+    ws = wb["Transformation - Sourcing (1)"]
+    rows = list(ws.iter_rows(min_row=3, max_row=3, max_col=2, values_only=True))
+    assert rows[0][1] == entity["name"]
+    wb.close()
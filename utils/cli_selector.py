@@ -1,6 +1,8 @@
-import xml.etree.ElementTree as ET
 from pathlib import Path
 
+from utils.dez_parser import iter_dez_elements
+from utils.selection import parse_selection
+
 
 def build_diagram_mapping(dez_path: str | Path):
     """
@@ -14,28 +16,27 @@ def build_diagram_mapping(dez_path: str | Path):
       id2name, diag2names = build_diagram_mapping("orders_bq.dez")
       # diag2names -> { "Sales Diagram": ["Order", "Party"], ... }
     """
-    tree = ET.parse(dez_path)
-    root = tree.getroot()
-
-    # Map entity ID -> entity NAME
-    id2name = {
-        ent.findtext("ID"): ent.findtext("NAME")
-        for ent in root.findall(".//ENTITIES/ENT")
-        if ent.findtext("ID") and ent.findtext("NAME")
-    }
+    # One streaming pass dispatching on tag; controls are buffered so the
+    # result is independent of element order within the file.
+    id2name: dict[str, str] = {}
+    diag_id2name: dict[str, str] = {}
+    controls: list[tuple[str, str]] = []
 
-    # Map diagram ID -> diagram NAME
-    diag_id2name = {
-        d.findtext("ID"): d.findtext("NAME")
-        for d in root.findall(".//DIAGRAMS/DIAGRAM")
-        if d.findtext("ID") and d.findtext("NAME")
-    }
+    for elem in iter_dez_elements(dez_path, ("ENT", "DIAGRAM", "ENTC")):
+        if elem.tag == "ENT":
+            eid, name = elem.findtext("ID"), elem.findtext("NAME")
+            if eid and name:
+                id2name[eid] = name
+        elif elem.tag == "DIAGRAM":
+            did, name = elem.findtext("ID"), elem.findtext("NAME")
+            if did and name:
+                diag_id2name[did] = name
+        else:  # ENTC
+            controls.append((elem.findtext("DIAGRAMID"), elem.findtext("ID")))
 
     # Collect entity IDs per diagram
     diag2ids: dict[str, set[str]] = {did: set() for did in diag_id2name}
-    for entc in root.findall(".//DIAGRAMS/CONTROLS/ENTITYCONTROLS/ENTC"):
-        did = entc.findtext("DIAGRAMID")
-        eid = entc.findtext("ID")
+    for did, eid in controls:
         if did in diag2ids and eid in id2name:
             diag2ids[did].add(eid)
 
@@ -67,18 +68,16 @@ def interactive_choice(diag2names: dict[str, list[str]]) -> list[str]:
             idx += 1
         print()
 
-    choice = input(
-        "Enter numbers (comma-separated) to export those, or press Enter for ALL: "
-    ).strip()
+    try:
+        choice = input(
+            "Enter numbers (comma-separated) to export those, or press Enter for ALL: "
+        ).strip()
+    except EOFError:
+        # Non-interactive run (no stdin) — fall back to exporting everything
+        return []
     if not choice:
         return []  # Export all
 
-    selected = set()
-    for part in choice.split(","):
-        part = part.strip()
-        if part.isdigit():
-            num = int(part)
-            if num in index_map:
-                selected.add(index_map[num])
+    selected = {index_map[num] for num in parse_selection(choice, idx - 1)}
     print(f"\n→ You selected: {', '.join(sorted(selected))}\n")
     return sorted(selected)
@@ -1,199 +1,329 @@
+import functools
 import re
-import xml.etree.ElementTree as ET
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable
+
+try:
+    from lxml import etree as ET  # libxml2 C parser: much faster on big .dez files
+    _HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAVE_LXML = False
+
+
+def iter_dez_elements(filepath: str | Path, tags: tuple[str, ...]):
+    """
+    Stream elements with the given tags from a .dez file via iterparse,
+    clearing each element (and its already-processed siblings) as we go so
+    memory stays bounded by the largest single subtree.
+    """
+    if _HAVE_LXML:
+        for _, elem in ET.iterparse(str(filepath), events=("end",), tag=tags):
+            yield elem
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    else:
+        for _, elem in ET.iterparse(str(filepath), events=("end",)):
+            if elem.tag in tags:
+                yield elem
+                elem.clear()
+
+@dataclass(slots=True)
+class Field:
+    """One entity attribute, as written to a mapping-sheet row. Slots keep
+    the footprint far below an equivalent 15-key dict on wide schemas."""
+    name: str
+    description: str
+    datatype: str
+    sourced: bool
+    not_null: bool
+    src_table: str
+    src_attr: str
+    def_val: str
+    def_m1: str
+    def_m2: str
+    key_type: str
+    referenced_dimension: str
+    partitioning: str
+    clustering: str
+    derived_expr: str = ""
+
+
+# TABOPT DDL patterns, compiled once rather than per entity
+_PART_RE  = re.compile(r"PARTITION\s+BY\s+[^(]+\(\s*([^) ,]+)", re.IGNORECASE)
+_CLUST_RE = re.compile(r"CLUSTER\s+BY\s+([^\n\r]+)", re.IGNORECASE)
+_UPPER_RE = re.compile(r"[A-Z]")
+
+
+@functools.lru_cache(maxsize=1024)
+def _alias_for(table_val: str) -> str:
+    """Alias for a source table (its capitals, else first two letters)."""
+    return "".join(_UPPER_RE.findall(table_val)) or table_val[:2].upper()
 
 # -----------------------------------------------------------------------------
 # Default‐values map for BigQuery types & naming conventions
 # -----------------------------------------------------------------------------
-DEFAULTS = {
-    "TIMESTAMP-Start": {
-        "Default Values": '"1900-01-01 00:00:00.0000"',
-        "Default Records": '"1900-01-01 00:00:00.0000"',
-        "Default Records (2)": '"1900-01-01 00:00:00.0000"',
-    },
-    "TIMESTAMP-End": {
-        "Default Values": '"9999-12-31 23:59:59.9999"',
-        "Default Records": '"9999-12-31 23:59:59.9999"',
-        "Default Records (2)": '"9999-12-31 23:59:59.9999"',
-    },
-    "TIMESTAMP": {
-        "Default Values": '"1900-01-01 00:00:00.0000"',
-        "Default Records": '"1900-01-01 00:00:00.0000"',
-        "Default Records (2)": '"9999-12-31 23:59:59.9999"',
-    },
-    "DATETIME": {
-        "Default Values": '"1900-01-01 00:00:00.0000"',
-        "Default Records": '"1900-01-01 00:00:00.0000"',
-        "Default Records (2)": '"9999-12-31 23:59:59.9999"',
-    },
-    "DATE": {
-        "Default Values": '"1900-01-01"',
-        "Default Records": '"1900-01-01"',
-        "Default Records (2)": '"9999-12-31"',
-    },
-    "INT64": {
-        "Default Values": "-1",
-        "Default Records": "-1",
-        "Default Records (2)": "-2",
-    },
-    "STRING": {
-        "Default Values": '""',
-        "Default Records": '""',
-        "Default Records (2)": '""',
-    },
-    "BOOL": {
-        "Default Values": "NULL",
-        "Default Records": "NULL",
-        "Default Records (2)": "NULL",
-    },
-    "NUMERIC": {
-        "Default Values": "0",
-        "Default Records": "0",
-        "Default Records (2)": "0",
-    },
-    "FLOAT64": {
-        "Default Values": '"0.0"',
-        "Default Records": '"0.0"',
-        "Default Records (2)": '"0.0"',
-    },
+# Per type: (Default Values, Default Records, Default Records (2))
+DEFAULTS: dict[str, tuple[str, str, str]] = {
+    "TIMESTAMP-Start": ('"1900-01-01 00:00:00.0000"', '"1900-01-01 00:00:00.0000"', '"1900-01-01 00:00:00.0000"'),
+    "TIMESTAMP-End":   ('"9999-12-31 23:59:59.9999"', '"9999-12-31 23:59:59.9999"', '"9999-12-31 23:59:59.9999"'),
+    "TIMESTAMP":       ('"1900-01-01 00:00:00.0000"', '"1900-01-01 00:00:00.0000"', '"9999-12-31 23:59:59.9999"'),
+    "DATETIME":        ('"1900-01-01 00:00:00.0000"', '"1900-01-01 00:00:00.0000"', '"9999-12-31 23:59:59.9999"'),
+    "DATE":            ('"1900-01-01"', '"1900-01-01"', '"9999-12-31"'),
+    "INT64":           ("-1", "-1", "-2"),
+    "STRING":          ('""', '""', '""'),
+    "BOOL":            ("NULL", "NULL", "NULL"),
+    "NUMERIC":         ("0", "0", "0"),
+    "FLOAT64":         ('"0.0"', '"0.0"', '"0.0"'),
 }
+# Intern once at import: every field's three default slots then point into
+# this small shared pool no matter how large the schema is
+DEFAULTS = {k: tuple(sys.intern(s) for s in v) for k, v in DEFAULTS.items()}
+
+# Shared miss value for unknown datatypes
+NO_DEFAULTS = ("", "", "")
+
+@functools.lru_cache(maxsize=None)
+def _resolve(dtype_key: str, is_start: bool, is_end: bool) -> tuple[str, str, str]:
+    """Memoized defaults lookup; the key space is tiny (datatypes × 2 flags)."""
+    if is_start:
+        dtype_key = "TIMESTAMP-Start"
+    elif is_end:
+        dtype_key = "TIMESTAMP-End"
+    return DEFAULTS.get(dtype_key, NO_DEFAULTS)
 
 def resolve_defaults(col_name: str, dtype: str) -> dict:
     """Pick default‐value set based on column name or datatype."""
-    key = dtype.upper()
     lower = col_name.lower()
-    if "effective_start" in lower:
-        key = "TIMESTAMP-Start"
-    elif "effective_end" in lower:
-        key = "TIMESTAMP-End"
-    return DEFAULTS.get(key, {"Default Values": "", "Default Records": "", "Default Records (2)": ""})
+    def_val, def_m1, def_m2 = _resolve(
+        dtype.upper(), "effective_start" in lower, "effective_end" in lower
+    )
+    return {"Default Values": def_val, "Default Records": def_m1, "Default Records (2)": def_m2}
+
+# Parsed results keyed by (resolved path, mtime, size) so the interactive
+# flow, which hits the same .dez more than once, only pays for one parse;
+# the stat fields invalidate the entry whenever the file changes.
+_parse_cache: dict[tuple[str, int, int], list[dict]] = {}
+
+def _extract_raw_entity(elem) -> dict:
+    """Pull everything needed from one ENT element into plain Python data."""
+    # Direct-child navigation: no ElementPath evaluation per entity
+    pk_ids = set()
+    pkcon = elem.find("PKCON")
+    if pkcon is not None:
+        aids_el = pkcon.find("ATTRIBUTEIDS")
+        if aids_el is not None:
+            for a in aids_el:
+                if a.text:
+                    pk_ids.add(a.text.strip())
+
+    attrs = []
+    for attr in elem.iterfind("./ATTRIBUTES/ATTR"):
+        # One pass over the direct children replaces six findtext
+        # walks per attribute
+        aid = aname = ""
+        desc = ""
+        dtype = "STRING"
+        nn_val = "0"
+        udps: list[str] = []
+        for child in attr:
+            tag = child.tag
+            if tag == "ID":
+                aid = child.text or ""
+            elif tag == "NAME":
+                aname = child.text or ""
+            elif tag == "DESC":
+                desc = child.text or ""
+            elif tag == "DT":
+                dtn = child.find("DTLISTNAME")
+                if dtn is not None and dtn.text:
+                    # A handful of datatype strings repeat across every
+                    # field; interning shares one object per value
+                    dtype = sys.intern(dtn.text)
+            elif tag == "NNCON":
+                v = child.find("VALUE")
+                if v is not None and v.text:
+                    nn_val = v.text
+            elif tag == "USERDEFPROPS":
+                udps = [u.text or "" for u in child]
+        attrs.append({
+            "id":          aid,
+            "name":        aname,
+            "description": desc,
+            "datatype":    dtype,
+            "not_null":    nn_val == "1",
+            "udps":        udps,
+        })
+
+    return {
+        "id":            elem.findtext("ID", ""),
+        # Entity names recur as FK parents / referenced dimensions
+        "name":          sys.intern(elem.findtext("NAME", "")),
+        "description":   elem.findtext("DESC", ""),
+        "table_options": elem.findtext("TABOPT", "") or "",
+        "pk_ids":        pk_ids,
+        "attrs":         attrs,
+    }
+
+
+def _build_entity(raw: dict, this_fk_map: dict[str, str]) -> dict:
+    """Assemble one exportable entity dict from raw ENT data and its FK map."""
+    ent_name = raw["name"]
+    pk_ids = raw["pk_ids"]
+
+    # Table-level options
+    table_options = raw["table_options"]
+    # Pre-extract partition/cluster columns. Most tables carry neither
+    # clause, so a substring pre-check skips the regex engine entirely.
+    part_cols = frozenset()
+    clust_cols = frozenset()
+    opts_upper = table_options.upper() if table_options else ""
+    if "PARTITION" in opts_upper:
+        pm = _PART_RE.search(table_options)
+        if pm: part_cols = frozenset({pm.group(1).strip()})
+    if "CLUSTER" in opts_upper:
+        cm = _CLUST_RE.search(table_options)
+        if cm:
+            clust_cols = frozenset(c.strip() for c in cm.group(1).split(","))
+
+    fields = []
+    for attr in raw["attrs"]:
+        name  = attr["name"]
+        dtype = attr["datatype"]
+        nn    = attr["not_null"]
+
+        # Determine key type
+        aid = attr["id"]
+        is_pk = aid in pk_ids
+        is_fk = aid in this_fk_map
+        if is_pk and is_fk:
+            key_type = "PRIMARY, FOREIGN"
+        elif is_pk:
+            key_type = "PRIMARY"
+        elif is_fk:
+            key_type = "FOREIGN"
+        else:
+            key_type = ""
+
+        ref_dim = this_fk_map.get(aid,"")
+
+        # — Attribute‐level UDPs: take elements in order: [database, table, column]
+        udps      = attr["udps"]
+        db_val    = udps[0] if len(udps) > 0 else ""
+        table_val = udps[1] if len(udps) > 1 else ""
+        col_val   = udps[2] if len(udps) > 2 else ""
+
+        # Build alias from table_val (memoized — identical across fields)
+        alias = _alias_for(table_val)
+        src_table_disp = f"{table_val} AS {alias}" if table_val else ""
+        src_attr_disp  = f"{alias}.{col_val}" if col_val and alias else ""
+
+        # Partitioning / Clustering flags
+        part_flag  = "Y" if name in part_cols else ""
+        clust_flag = "Y" if name in clust_cols else ""
+
+        # Derived expression for Derived fields
+        sourced = not is_fk
+        derived_expr = "" if sourced else f"{ent_name}.{name}"
+
+        # Defaults
+        lower = name.lower()
+        def_val, def_m1, def_m2 = _resolve(
+            dtype.upper(), "effective_start" in lower, "effective_end" in lower
+        )
+
+        fields.append(Field(
+            name=name,
+            description=attr["description"],
+            datatype=dtype,
+            sourced=sourced,
+            not_null=nn,
+            src_table=src_table_disp,
+            src_attr=src_attr_disp,
+            def_val=def_val,
+            def_m1=def_m1,
+            def_m2=def_m2,
+            key_type=key_type,
+            referenced_dimension=ref_dim,
+            partitioning=part_flag,
+            clustering=clust_flag,
+            derived_expr=derived_expr,
+        ))
+
+    return {
+        "name":          ent_name,
+        "description":   raw["description"],
+        "table_options": table_options,
+        "fields":        fields,
+    }
+
+
+def iter_dez_entities(filepath: str | Path):
+    """
+    Yield entities one at a time, keeping memory bounded by a single ENT
+    subtree. A light first pass collects entity ids and FK pairs (the
+    RELATIONSHIPS section follows ENTITIES, so key types are unknown until
+    the document ends); the second pass streams fully-built entities.
+    """
+    id2name: dict[str, str] = {}
+    fk_for_entity: dict[str, dict[str,str]] = {}
+
+    for elem in iter_dez_elements(filepath, ("ENT", "REL")):
+        if elem.tag == "ENT":
+            eid = elem.findtext("ID", "")
+            name = elem.findtext("NAME", "")
+            if eid and name:
+                id2name[eid] = sys.intern(name)
+        else:  # REL
+            pid = elem.findtext("PARENTOBJECTID", "")
+            cid = elem.findtext("CHILDOBJECTID", "")
+            parent = id2name.get(pid, "")
+            if cid and parent:
+                # PAIR is always a direct grandchild — no descendant scan needed
+                pairs_el = elem.find("PAIRS")
+                if pairs_el is not None:
+                    fk_map = fk_for_entity.setdefault(cid, {})
+                    for pair in pairs_el:
+                        fk_attr = pair.findtext("FOREIGNKEYID")
+                        if fk_attr:
+                            fk_map[fk_attr] = parent
+
+    for elem in iter_dez_elements(filepath, ("ENT",)):
+        raw = _extract_raw_entity(elem)
+        yield _build_entity(raw, fk_for_entity.get(raw["id"], {}))
+
 
 def parse_dez_file(filepath: str | Path) -> list[dict]:
     """
     Parse a .dez file and return a list of entities with:
       - name, description
       - table_options (PARTITION/CLUSTER DDL)
-      - fields: list of {
-          name, description, datatype, sourced (bool), not_null,
-          src_table, src_attr, key_type, referenced_dimension,
-          def_val, def_m1, def_m2,
-          partitioning, clustering,
-          derived_expr (if Derived)
-        }
-    """
-    tree = ET.parse(filepath)
-    root = tree.getroot()
-
-    # 1) Build ID→NAME map for FK resolution
-    id2name = {
-        e.findtext("ID"): e.findtext("NAME")
-        for e in root.findall(".//ENTITIES/ENT")
-        if e.findtext("ID") and e.findtext("NAME")
-    }
+      - fields: list of Field records (see the Field dataclass above)
 
-    # 2) Gather all foreign key relationships
-    fk_for_entity: dict[str, dict[str,str]] = {}
-    for rel in root.findall(".//RELATIONSHIPS/REL"):
-        pid = rel.findtext("PARENTOBJECTID","")
-        cid = rel.findtext("CHILDOBJECTID","")
-        parent = id2name.get(pid,"")
-        if cid and parent:
-            fk_map = fk_for_entity.setdefault(cid,{})
-            for pair in rel.findall(".//PAIRS/PAIR"):
-                fk_attr = pair.findtext("FOREIGNKEYID")
-                if fk_attr:
-                    fk_map[fk_attr] = parent
-
-    entities = []
-    for ent in root.findall(".//ENTITIES/ENT"):
-        ent_name = ent.findtext("NAME","")
-        ent_desc = ent.findtext("DESC","")
-
-        # Primary key IDs
-        pk_ids = {
-            a.text.strip()
-            for a in ent.findall("./PKCON/ATTRIBUTEIDS/ATTRIBUTEID")
-            if a.text
-        }
-        this_fk_map = fk_for_entity.get(ent.findtext("ID",""), {})
-
-        # Table-level options
-        table_options = ent.findtext("TABOPT","") or ""
-        # Pre-extract partition/cluster columns
-        part_cols = []
-        clust_cols = []
-        pm = re.search(r"PARTITION\s+BY\s+[^(]+\(\s*([^) ,]+)", table_options, re.IGNORECASE)
-        if pm: part_cols = [pm.group(1).strip()]
-        cm = re.search(r"CLUSTER\s+BY\s+([^\n\r]+)", table_options, re.IGNORECASE)
-        if cm:
-            clust_cols = [c.strip() for c in cm.group(1).split(",")]
-
-        fields = []
-        for attr in ent.findall("./ATTRIBUTES/ATTR"):
-            name  = attr.findtext("NAME","")
-            dtype = attr.findtext("DT/DTLISTNAME","STRING")
-            nn    = (attr.findtext("./NNCON/VALUE") == "1")
-
-            # Determine key type
-            aid = attr.findtext("ID","")
-            is_pk = aid in pk_ids
-            is_fk = aid in this_fk_map
-            if is_pk and is_fk:
-                key_type = "PRIMARY, FOREIGN"
-            elif is_pk:
-                key_type = "PRIMARY"
-            elif is_fk:
-                key_type = "FOREIGN"
-            else:
-                key_type = ""
-
-            ref_dim = this_fk_map.get(aid,"")
-
-            # — Attribute‐level UDPs: take elements in order: [database, table, column]
-            udp_elems = list(attr.findall("./USERDEFPROPS/*"))
-            db_val    = udp_elems[0].text or "" if len(udp_elems) > 0 else ""
-            table_val = udp_elems[1].text or "" if len(udp_elems) > 1 else ""
-            col_val   = udp_elems[2].text or "" if len(udp_elems) > 2 else ""
-
-            # Build alias from table_val
-            alias = "".join([c for c in table_val if c.isupper()]) or table_val[:2].upper()
-            src_table_disp = f"{table_val} AS {alias}" if table_val else ""
-            src_attr_disp  = f"{alias}.{col_val}" if col_val and alias else ""
-
-            # Partitioning / Clustering flags
-            part_flag  = "Y" if name in part_cols else ""
-            clust_flag = "Y" if name in clust_cols else ""
-
-            # Derived expression for Derived fields
-            sourced = not is_fk
-            derived_expr = "" if sourced else f"{ent_name}.{name}"
-
-            # Defaults
-            defs = resolve_defaults(name, dtype)
-
-            fields.append({
-                "name": name,
-                "description": attr.findtext("DESC","") or "",
-                "datatype": dtype,
-                "sourced": sourced,
-                "not_null": nn,
-                "src_table": src_table_disp,
-                "src_attr":  src_attr_disp,
-                "def_val":   defs["Default Values"],
-                "def_m1":    defs["Default Records"],
-                "def_m2":    defs["Default Records (2)"],
-                "key_type":  key_type,
-                "referenced_dimension": ref_dim,
-                "partitioning": part_flag,
-                "clustering":  clust_flag,
-                "derived_expr": derived_expr,
-            })
-
-        entities.append({
-            "name":          ent_name,
-            "description":   ent_desc,
-            "table_options": table_options,
-            "fields":        fields,
-        })
+    Results are memoized per file; use iter_dez_entities directly when
+    streaming a huge model one entity at a time.
+    """
+    path = Path(filepath)
+    st = path.stat()
+    cache_key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    cached = _parse_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
+    entities = list(iter_dez_entities(filepath))
+    _parse_cache[cache_key] = entities
     return entities
+
+
+def parse_many(paths: Iterable[str | Path], workers: int | None = None) -> list[list[dict]]:
+    """
+    Parse several .dez files in parallel, one result list per input path.
+    Parsing is CPU-bound with no shared state, so a process pool scales
+    roughly with core count.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_dez_file, paths, chunksize=4))
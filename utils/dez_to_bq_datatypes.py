@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import re
 
 TYPE_MAP = {
     "INTEGER": "INT64",
@@ -21,16 +22,21 @@ TYPE_MAP = {
     "BOOL": "BOOL",
 }
 
-def convert_dez_file(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+# One compiled alternation replaces a full-string .replace() pass per type
+_TYPE_RE = re.compile(
+    r"<DTLISTNAME>(" + "|".join(map(re.escape, TYPE_MAP)) + r")</DTLISTNAME>"
+)
 
-    for old, new in TYPE_MAP.items():
-        content = content.replace(f"<DTLISTNAME>{old}</DTLISTNAME>", f"<DTLISTNAME>{new}</DTLISTNAME>")
+def _to_bq(match):
+    return f"<DTLISTNAME>{TYPE_MAP[match.group(1)]}</DTLISTNAME>"
 
+def convert_dez_file(file_path):
     out_path = file_path.replace(".dez", "_bq.dez")
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    # Stream line by line so peak memory stays flat regardless of file size
+    with open(file_path, "r", encoding="utf-8") as src, \
+         open(out_path, "w", encoding="utf-8") as dst:
+        for line in src:
+            dst.write(_TYPE_RE.sub(_to_bq, line))
 
     print(f"✅ Converted and saved: {out_path}")
 
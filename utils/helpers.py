@@ -1,4 +1,4 @@
-import copy
+import functools
 # === HELPERS ===
 
 # Manual mapping for renamed columns (lowercased and normalized)
@@ -14,7 +14,9 @@ def copy_metadata(ws_src, ws_tgt):
         if val not in (None, ""):
             ws_tgt.cell(row=row, column=2).value = val
 
+@functools.lru_cache(maxsize=4096)
 def normalize(text):
+    """Cached: the same dozen header captions are normalized per cell scan."""
     return str(text).strip().lower() if text else ""
 
 def get_header_row(ws, match_value):
@@ -43,32 +45,37 @@ def copy_table(ws_src, ws_tgt, src_header_row, tgt_header_row, label):
     src_cols = get_column_map(ws_src, src_header_row)
     tgt_cols = get_column_map(ws_tgt, tgt_header_row)
 
-    row = 0
-    copied_rows = 0
-
-    while True:
-        src_r = src_header_row + 1 + row
-        tgt_r = tgt_header_row + 1 + row
+    if not src_cols:
+        print(f"✅ Copied 0 rows from {label}")
+        return
 
-        # ✅ Stop if source row is entirely blank
-        if src_r > ws_src.max_row:
-            break
+    # ✅ Resolve source→target column index pairs once, outside the row loop
+    pairs = []
+    for src_name, src_col in src_cols.items():
+        mapped_name = normalize(COLUMN_NAME_MAPPING.get(src_name, src_name))
+        tgt_col = tgt_cols.get(mapped_name)
+        if tgt_col is not None:
+            pairs.append((src_col - 1, tgt_col))
+    probe_idx = [c - 1 for c in src_cols.values()]
 
-        src_blank = all(ws_src.cell(src_r, c).value in (None, "") for c in src_cols.values())
-        if src_blank:
+    copied_rows = 0
+    tgt_r = tgt_header_row + 1
+
+    # iter_rows with values_only streams raw tuples instead of building a
+    # Cell object per probe/read
+    for row_vals in ws_src.iter_rows(
+        min_row=src_header_row + 1, max_col=max(src_cols.values()), values_only=True
+    ):
+        # ✅ Stop at the first entirely blank source row
+        if all(row_vals[i] in (None, "") for i in probe_idx):
             break
 
-        for src_name, src_col in src_cols.items():
-            mapped_name = normalize(COLUMN_NAME_MAPPING.get(src_name, src_name))
-            if mapped_name not in tgt_cols:
-                continue
-            tgt_col = tgt_cols[mapped_name]
-            src_val = ws_src.cell(src_r, src_col).value
+        for src_i, tgt_col in pairs:
             tgt_cell = ws_tgt.cell(tgt_r, tgt_col)
-            tgt_cell.value = src_val
+            tgt_cell.value = row_vals[src_i]
             tgt_cell.number_format = "General"
 
-        row += 1
+        tgt_r += 1
         copied_rows += 1
 
     print(f"✅ Copied {copied_rows} rows from {label}")
@@ -79,7 +86,6 @@ def unwrap_merged_headers(ws, header_row):
     Unmerge header cells, assign enumerated names to duplicates, and preserve formatting.
     """
     merged_ranges = [rng for rng in ws.merged_cells.ranges if rng.min_row == header_row]
-    seen = {}
 
     for rng in merged_ranges:
         if rng.min_row != rng.max_row:
@@ -88,24 +94,17 @@ def unwrap_merged_headers(ws, header_row):
 
         top_cell = ws.cell(row=header_row, column=rng.min_col)
         base_val = str(top_cell.value).strip()
-        base_font = copy.copy(top_cell.font)
-        base_fill = copy.copy(top_cell.fill)
-        base_alignment = copy.copy(top_cell.alignment)
-        base_border = copy.copy(top_cell.border)
-
-        for col in range(rng.min_col, rng.max_col + 1):
-            count = seen.get(base_val, 0) + 1
-            seen[base_val] = count
-            new_val = base_val if count == 1 else f"{base_val} ({count})"
+        # Sharing the top cell's StyleArray carries font, fill, alignment
+        # and border across the span in one assignment, with no copies
+        style = top_cell._style if top_cell.has_style else None
 
+        for col in range(rng.min_col + 1, rng.max_col + 1):
             cell = ws.cell(row=header_row, column=col)
-            cell.value = new_val
-            cell.font = copy.copy(base_font)
-            cell.fill = copy.copy(base_fill)
-            cell.alignment = copy.copy(base_alignment)
-            cell.border = copy.copy(base_border)
+            cell.value = base_val
+            if style is not None:
+                cell._style = style
 
-    # Second pass: deduplicate any already existing header collisions
+    # Single dedupe pass covers unwrapped spans and pre-existing collisions
     seen = {}
     for cell in ws[header_row]:
         val = str(cell.value).strip() if cell.value else ""
@@ -0,0 +1,14 @@
+import re
+
+_NUMBER_RE = re.compile(r"\d+")
+
+
+def parse_selection(raw: str, valid_max: int) -> list[int]:
+    """
+    Extract the 1-based indices from a comma/space-separated selection
+    string, keeping only those within [1, valid_max].
+
+    Example:
+      parse_selection("1, 3, 12", 10) -> [1, 3]
+    """
+    return sorted({int(m) for m in _NUMBER_RE.findall(raw) if 1 <= int(m) <= valid_max})
@@ -1,7 +1,19 @@
+import io
 from pathlib import Path
 from openpyxl import load_workbook
 from utils.helpers import get_header_row, unwrap_merged_headers, normalize
-import copy
+
+# Raw template bytes cached per path so exporting N entities parses the
+# template ZIP from disk only once.
+_template_bytes: dict[str, bytes] = {}
+
+def _load_template(template_path: str | Path):
+    key = str(template_path)
+    buf = _template_bytes.get(key)
+    if buf is None:
+        buf = Path(template_path).read_bytes()
+        _template_bytes[key] = buf
+    return load_workbook(io.BytesIO(buf))
 
 HDRS = {
   "name":"Attribute Name",       "desc":"Attribute Description",
@@ -13,17 +25,21 @@ HDRS = {
   "clust":"Clustering",          "part":"Partitioning",
   "key":"Keys"
 }
+# Normalized once at import; C(key) below then needs only a dict lookup
+HDRS_NORM = {k: normalize(v) for k, v in HDRS.items()}
 
 def _build_map(ws, hdr_row:int) -> dict[str,int]:
     unwrap_merged_headers(ws, hdr_row)
     return {normalize(c.value): c.column for c in ws[hdr_row] if c.value}
 
-def _copy_style_only(ws, src_row:int, dst_row:int) -> None:
-    for col in range(1, ws.max_column+1):
-        s, d = ws.cell(src_row,col), ws.cell(dst_row,col)
-        if s.has_style:
-            d._style = copy.copy(s._style)
-        d.number_format = s.number_format
+def _copy_style_only(ws, src_row:int, dst_rows) -> None:
+    # Read each source style once; the StyleArray (which carries the number
+    # format) is never mutated afterwards, so every destination cell can
+    # reference the same object instead of a per-cell copy
+    src_styles = [(c.column, c._style) for c in ws[src_row] if c.has_style]
+    for dst_row in dst_rows:
+        for col, style in src_styles:
+            ws.cell(dst_row, col)._style = style
 
 def _write_sourcing(ws, entity:dict) -> None:
     hdr = get_header_row(ws, "Dependency")
@@ -32,12 +48,12 @@ def _write_sourcing(ws, entity:dict) -> None:
     # only attribute-level sourcing is shown in Transformation section below
 
 def write_entity(entity:dict, template_path:str|Path, out_dir:str|Path) -> Path:
-    wb = load_workbook(template_path)
+    wb = _load_template(template_path)
     ws = wb["Transformation - Sourcing (1)"]
 
-    # 1) Metadata
-    ws["B3"] = entity["name"]
-    ws["B4"] = entity["description"]
+    # 1) Metadata (ws.cell skips openpyxl's "B3"-style coordinate parsing)
+    ws.cell(row=3, column=2, value=entity["name"])
+    ws.cell(row=4, column=2, value=entity["description"])
 
     # 2) Table options line
     th = get_header_row(ws, "#")
@@ -49,48 +65,52 @@ def write_entity(entity:dict, template_path:str|Path, out_dir:str|Path) -> Path:
     cmap = _build_map(ws, th)
 
     # 4) Validate headers
-    for cap in HDRS.values():
-        if normalize(cap) not in cmap:
+    for key, cap in HDRS.items():
+        if HDRS_NORM[key] not in cmap:
             raise ValueError(f"Missing header: {cap!r}")
 
     start = th + 1
     needed = len(entity["fields"])
     CAP = 500
 
-    # 5) Expand if >500
+    # 5) Expand if >500. The template ships its first CAP data rows already
+    #    styled, so only freshly inserted rows need restyling.
     if needed > CAP:
         extra = needed - CAP
         ins   = start + CAP
         ws.insert_rows(ins, extra)
-        for off in range(extra):
-            _copy_style_only(ws, start+CAP-1, ins+off)
+        _copy_style_only(ws, start+CAP-1, range(ins, ins+extra))
 
-    # 6) Copy style-only for each row
-    for i in range(needed):
-        _copy_style_only(ws, start, start+i)
+    # 6) Write each field (skip '#' column). Column positions are resolved
+    #    once; each row is fetched once and assigned by index, instead of a
+    #    ws.cell() lookup per column.
+    def C(key): return cmap[HDRS_NORM[key]] - 1
 
-    # 7) Write each field (skip '#' column)
-    def C(key): return cmap[normalize(HDRS[key])]
+    c_name, c_desc, c_type  = C("name"), C("desc"), C("type")
+    c_sd, c_src_t, c_src_a  = C("sd"), C("src_t"), C("src_a")
+    c_deriv, c_ref, c_nn    = C("derivation"), C("ref_dim"), C("nn")
+    c_dv, c_m1, c_m2        = C("def_v"), C("def_m1"), C("def_m2")
+    c_clust, c_part, c_key  = C("clust"), C("part"), C("key")
 
     for i, f in enumerate(entity["fields"]):
-        r = start + i
-        ws.cell(r, C("name")).value        = f["name"]
-        ws.cell(r, C("desc")).value        = f["description"]
-        ws.cell(r, C("type")).value        = f["datatype"]
-        ws.cell(r, C("sd")).value          = "Sourced" if f["sourced"] else "Derived"
-        if f["sourced"]:
-            ws.cell(r, C("src_t")).value   = f["src_table"]
-            ws.cell(r, C("src_a")).value   = f["src_attr"]
+        cells = ws[start + i]
+        cells[c_name].value    = f.name
+        cells[c_desc].value    = f.description
+        cells[c_type].value    = f.datatype
+        cells[c_sd].value      = "Sourced" if f.sourced else "Derived"
+        if f.sourced:
+            cells[c_src_t].value = f.src_table
+            cells[c_src_a].value = f.src_attr
         else:
-            ws.cell(r, C("derivation")).value = f["derived_expr"]
-        ws.cell(r, C("ref_dim")).value     = f["referenced_dimension"]
-        ws.cell(r, C("nn")).value          = "Y" if f["not_null"] else "N"
-        ws.cell(r, C("def_v")).value       = f["def_val"]
-        ws.cell(r, C("def_m1")).value      = f["def_m1"]
-        ws.cell(r, C("def_m2")).value      = f["def_m2"]
-        ws.cell(r, C("clust")).value       = f["clustering"]
-        ws.cell(r, C("part")).value        = f["partitioning"]
-        ws.cell(r, C("key")).value         = f["key_type"]
+            cells[c_deriv].value = f.derived_expr
+        cells[c_ref].value     = f.referenced_dimension
+        cells[c_nn].value      = "Y" if f.not_null else "N"
+        cells[c_dv].value      = f.def_val
+        cells[c_m1].value      = f.def_m1
+        cells[c_m2].value      = f.def_m2
+        cells[c_clust].value   = f.clustering
+        cells[c_part].value    = f.partitioning
+        cells[c_key].value     = f.key_type
 
     out = Path(out_dir)/f"{entity['name']}.xlsx"
     wb.save(out)